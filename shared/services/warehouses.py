@@ -3,6 +3,7 @@
 import os
 
 # Third Party
+from django.db import transaction
 from django.db.utils import IntegrityError
 
 # First Party
@@ -15,11 +16,12 @@ from shared.exceptions import (
 
 
 def init_warehouses(config):
-    default_warehouse = Warehouse.objects.filter(is_default=True).first()
-    if not default_warehouse:
+    if not Warehouse.objects.filter(is_default=True).exists():
         default = config["default_warehouse"]
-        default["path"] = os.path.abspath(default["path"])
-        create_warehouse(**default)
+        # copy rather than rewrite the caller's config in place
+        create_warehouse(
+            **{**default, "path": os.path.abspath(default["path"])}
+        )
 
 
 def list_warehouses():
@@ -29,19 +31,18 @@ def list_warehouses():
 def create_warehouse(name, path, is_default=False):
     abs_path = check_and_make_valid_path_param(path)
     try:
-        wh = Warehouse.objects.create(
-            name=name, path=abs_path, is_default=is_default
-        )
-        if is_default:
-            # find any other defaults and unset them
-            other_default_warehouses = Warehouse.objects.filter(
-                # id != wh.id,
-                is_default=True,
-            ).all()
-            for other_warehouse in other_default_warehouses:
-                if other_warehouse.id != wh.id:
-                    other_warehouse.is_default = False
-                    other_warehouse.save()
+        # the insert and the default flag change commit together; this
+        # keeps a single default only because SQLite runs one writer at
+        # a time
+        with transaction.atomic():
+            wh = Warehouse.objects.create(
+                name=name, path=abs_path, is_default=is_default
+            )
+            if is_default:
+                # unset any other defaults in a single UPDATE
+                Warehouse.objects.filter(is_default=True).exclude(
+                    id=wh.id
+                ).update(is_default=False)
 
         return wh
 
@@ -50,10 +51,8 @@ def create_warehouse(name, path, is_default=False):
 
 
 def delete_warehouse(id):
-    wh = Warehouse.objects.filter(id=id).first()
-    if wh:
-        wh.delete()
-    else:
+    deleted, _ = Warehouse.objects.filter(id=id).delete()
+    if not deleted:
         raise AfDoesNotExistException(
             f"A warehouse with ID {id} does not exist"
         )
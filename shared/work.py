@@ -1,6 +1,6 @@
 # shared/work.py
-def get_test_message():
-    return "This is a test message from shared code."
+# First Party
+from shared.messages import get_test_message
 
 
 def perform_worker_task():
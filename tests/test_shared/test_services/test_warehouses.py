@@ -3,57 +3,36 @@ import os
 
 # Third Party
 import pytest
-from django.core.management import call_command
-
-# First Party
-from shared.exceptions import AfDoesNotExistException, AfDuplicateException
-
-
-# @pytest.fixture(scope="session", autouse=True)
-def django_setup():
-    os.environ["DJANGO_SETTINGS_MODULE"] = "art_factory.settings"
-
-    # Third Party
-    import django
-
-    django.setup()
-
-    # Run migrations before tests
-    call_command("migrate")
-
-
-django_setup()
-test_dirs = []
-
 
 # First Party
 from main.models import Warehouse
+from shared.exceptions import AfDoesNotExistException, AfDuplicateException
 from shared.services.warehouses import (
     create_warehouse,
     delete_warehouse,
     init_warehouses,
 )
 
+DEFAULT_CONFIG = {
+    "default_warehouse": {
+        "name": "Default",
+        "path": "default_warehouse",
+        "is_default": True,
+    }
+}
 
-@pytest.fixture(scope="session", autouse=True)
-def django_setup():
-    yield
 
-    Warehouse.objects.all().delete()
-    for test_dir in test_dirs:
-        if os.path.exists(test_dir) and not os.listdir(test_dir):
-            os.rmdir(test_dir)
+@pytest.fixture(autouse=True)
+def warehouse_root(tmp_path, monkeypatch):
+    """Run each test from a temporary directory so warehouse paths created
+    on disk never land in the working tree"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
 
 
 @pytest.fixture
 def default_config():
-    return {
-        "default_warehouse": {
-            "name": "Default",
-            "path": "default_warehouse",
-            "is_default": True,
-        }
-    }
+    return DEFAULT_CONFIG
 
 
 # init_warehouses
@@ -67,6 +46,12 @@ def test_init_warehouses_creates_default_warehouse(default_config):
     assert os.path.isabs(default_warehouse.path)
 
 
+@pytest.mark.django_db
+def test_init_warehouses_does_not_modify_config(default_config):
+    init_warehouses(default_config)
+    assert default_config["default_warehouse"]["path"] == "default_warehouse"
+
+
 @pytest.mark.django_db
 def test_init_warehouses_does_not_create_if_exists(default_config):
     Warehouse.objects.create(
@@ -79,6 +64,15 @@ def test_init_warehouses_does_not_create_if_exists(default_config):
     assert warehouses.count() == 1
 
 
+@pytest.mark.django_db
+def test_init_warehouses_checks_for_default_in_one_query(
+    default_config, django_assert_num_queries
+):
+    init_warehouses(default_config)
+    with django_assert_num_queries(1):
+        init_warehouses(default_config)
+
+
 # create_warehouse
 
 
@@ -97,9 +91,9 @@ def test_create_warehouse_duplicate_paths_cause_exception(default_config):
         )
 
 
+@pytest.mark.django_db
 def test_create_warehouse_keeps_single_default(default_config):
     init_warehouses(default_config)
-    test_dirs.append("default_warehouse_test")
     create_warehouse(
         name="a",
         path=os.path.abspath("default_warehouse_test"),
@@ -109,16 +103,32 @@ def test_create_warehouse_keeps_single_default(default_config):
     assert default_warehouses.count() == 1
 
 
+@pytest.mark.django_db
+def test_create_warehouse_unsets_defaults_in_one_update(
+    django_assert_num_queries,
+):
+    Warehouse.objects.bulk_create(
+        [
+            Warehouse(name=name, path=os.path.abspath(name), is_default=True)
+            for name in ("a", "b", "c")
+        ]
+    )
+    # savepoint, insert, update, release
+    with django_assert_num_queries(4):
+        create_warehouse(name="d", path="./d", is_default=True)
+    assert Warehouse.objects.filter(is_default=True).count() == 1
+
+
+@pytest.mark.django_db
 def test_create_warehouse_defaults_is_default_to_false(default_config):
     init_warehouses(default_config)
-    test_dirs.append("./warehouse_test_1")
     warehouse = create_warehouse(name="a", path="./warehouse_test_1")
-    assert not warehouse.is_default
+    assert warehouse.is_default is False
 
 
+@pytest.mark.django_db
 def test_create_warehouse_saves_absolute_path(default_config):
     init_warehouses(default_config)
-    test_dirs.append("./warehouse_test_2")
     warehouse = create_warehouse(name="a", path="./warehouse_test_2")
     assert warehouse.path != "./warehouse_test"
     assert os.path.exists(warehouse.path)
@@ -138,7 +148,17 @@ def test_delete_warehouse(default_config):
     delete_warehouse(id=warehouse.id)
 
 
+@pytest.mark.django_db
 def test_delete_warehouse_with_invalid_id_throws_exception(default_config):
     init_warehouses(default_config)
     with pytest.raises(AfDoesNotExistException):
         delete_warehouse(id=500)
+
+
+@pytest.mark.django_db
+def test_delete_warehouse_uses_one_query(django_assert_num_queries):
+    warehouse = Warehouse.objects.create(
+        name="a", path=os.path.abspath("a"), is_default=False
+    )
+    with django_assert_num_queries(1):
+        delete_warehouse(id=warehouse.id)